@@ -1,13 +1,14 @@
-import requests
 from bs4 import BeautifulSoup
 import re
-import json
-import os
 import concurrent.futures
 
+from common import new_session, write_json
+import summary
+
 # CONFIG
 BASE_URL = "https://cloud.colocrossing.com"
 STORE_HOME = "https://cloud.colocrossing.com/index.php?rp=/store"
+POOL_SIZE = 10
 
 def parse_specs(text, title):
     specs = {
@@ -71,7 +72,7 @@ def scrape_category(cat_url):
     print(f"Scraping Category: {cat_url}")
     products = []
     try:
-        res = requests.get(cat_url, headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'})
+        res = new_session(POOL_SIZE).get(cat_url, timeout=15, headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'})
         if res.status_code != 200: return []
         
         soup = BeautifulSoup(res.text, 'html.parser')
@@ -137,7 +138,7 @@ def scrape_all():
     print("Starting Spider Scan (Categories)...")
     
     # 1. Get Categories
-    res = requests.get(STORE_HOME, headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'})
+    res = new_session(POOL_SIZE).get(STORE_HOME, timeout=15, headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'})
     soup = BeautifulSoup(res.text, 'html.parser')
     
     categories = []
@@ -174,11 +175,12 @@ def scrape_all():
     print(f"Total Unique Products: {len(final_list)}")
     
     # Sort
-    os.makedirs("public", exist_ok=True)
     final_list.sort(key=lambda x: x['value_score'], reverse=True)
     
-    with open("public/ccs.json", "w", encoding='utf-8') as f:
-        json.dump(final_list, f, indent=2, ensure_ascii=False)
+    write_json("public/ccs.json", final_list)
+
+    summary.publish_summary()
+    return final_list
 
 if __name__ == "__main__":
     scrape_all()
@@ -0,0 +1,71 @@
+import gzip
+import json
+import os
+import time
+
+from common import write_json
+
+# On-disk progress for long PID sweeps, so an interrupted run can --resume.
+# State is gzipped JSON; completed PIDs are stored as [start, end] ranges.
+
+STATE_DIR = "state"
+CHECKPOINT_EVERY = 100 # completed PIDs
+CHECKPOINT_SECONDS = 30
+MAX_ATTEMPTS = 3 # per PID, across resumed runs; then the sweep publishes without it
+MAX_AGE = 6 * 3600 # older state (e.g. a stale CI cache) is ignored, not resumed
+
+def state_path(name, shard=None):
+    if shard is None: return f"{STATE_DIR}/{name}.json.gz"
+    i, n = shard
+    return f"{STATE_DIR}/{name}.{i}of{n}.json.gz"
+
+def encode_pids(pids):
+    ranges = []
+    for pid in sorted(pids):
+        if ranges and pid == ranges[-1][1] + 1:
+            ranges[-1][1] = pid
+        else:
+            ranges.append([pid, pid])
+    return ranges
+
+def decode_pids(ranges):
+    done = set()
+    for start, end in ranges:
+        done.update(range(start, end + 1))
+    return done
+
+def save(path, state):
+    write_json(path, dict(state, saved_at=int(time.time())), compress=True)
+
+def load(path, max_age=MAX_AGE):
+    if not os.path.exists(path): return None
+    try:
+        with gzip.open(path, "rt", encoding='utf-8') as f:
+            state = json.load(f)
+    except Exception as e:
+        print(f"Ignoring unreadable checkpoint {path}: {e}")
+        return None
+    if time.time() - state.get('saved_at', 0) > max_age:
+        print(f"Ignoring stale checkpoint {path}")
+        return None
+    return state
+
+def clear(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+class Checkpointer:
+    # Decides when the next periodic save is due
+    def __init__(self, every=CHECKPOINT_EVERY, seconds=CHECKPOINT_SECONDS):
+        self.every = every
+        self.seconds = seconds
+        self.pending = 0
+        self.last = time.time()
+
+    def tick(self):
+        self.pending += 1
+        if self.pending >= self.every or time.time() - self.last >= self.seconds:
+            self.pending = 0
+            self.last = time.time()
+            return True
+        return False
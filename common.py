@@ -0,0 +1,39 @@
+import gzip
+import json
+import os
+import threading
+
+import requests
+
+# Helpers shared by the scrapers.
+
+_adapters = {} # pool_maxsize -> HTTPAdapter
+_adapters_lock = threading.Lock()
+
+def new_session(pool_maxsize=10):
+    # Sessions stay cookie-isolated (carts are per session), but every session
+    # asking for the same pool size shares one HTTPAdapter, so TCP/TLS connections
+    # are reused across requests and across repeated scrape_all() runs (daemon mode).
+    # Don't close() these sessions: that would also close the shared adapter.
+    with _adapters_lock:
+        adapter = _adapters.get(pool_maxsize)
+        if adapter is None:
+            adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize)
+            _adapters[pool_maxsize] = adapter
+    s = requests.Session()
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+def write_json(path, data, compress=False):
+    # Write then rename, so readers never see a half-written file and a kill
+    # mid-write never leaves a corrupt one. compress: compact gzipped JSON.
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    if compress:
+        with gzip.open(tmp, "wt", encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    else:
+        with open(tmp, "w", encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
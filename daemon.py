@@ -0,0 +1,174 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import ccs_scraper
+import dedirock_scraper
+import rn_scraper
+import summary
+
+# Long-running mode: keeps each scraper's connection pool warm, re-scrapes every
+# provider on its own jittered schedule and serves the latest results over HTTP.
+# public/*.json is still written by every scrape_all() run, for publishing.
+
+# name -> (scraper module, base interval in seconds, scrape_all kwargs)
+PROVIDERS = {
+    "dedirock": (dedirock_scraper, 3600, {}),
+    # A failed sweep keeps its checkpoint; the next run retries only what's missing
+    "rn": (rn_scraper, 3600, {"resume": True}),
+    "ccs": (ccs_scraper, 3600, {}),
+}
+JITTER = 0.1 # +/- 10% of the interval
+START_SPREAD = 60 # stagger first runs over this many seconds
+
+
+class ResultStore:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.results = {}
+        self.updated = {}
+        self.bodies = {} # path -> (etag, bytes)
+
+    def update(self, name, products):
+        with self.lock:
+            self.results[name] = products
+            self.updated[name] = int(time.time())
+            self.bodies[f"/{name}.json"] = self._encode(products)
+
+            merged = []
+            for prov, items in self.results.items():
+                merged.extend(dict(p, provider=prov) for p in items)
+            merged.sort(key=lambda x: x['value_score'], reverse=True)
+            self.bodies["/all.json"] = self._encode(merged)
+            self.bodies["/summary.json"] = self._encode(summary.summarize(self.results))
+
+            status = {n: {"count": len(self.results[n]), "updated": self.updated[n]} for n in sorted(self.results)}
+            self.bodies["/"] = self._encode(status)
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.results)
+
+    def get(self, path):
+        with self.lock:
+            return self.bodies.get(path)
+
+    @staticmethod
+    def _encode(data):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        return '"' + hashlib.sha1(body).hexdigest() + '"', body
+
+
+STORE = ResultStore()
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = self._send_headers()
+        if body is not None:
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._send_headers()
+
+    def _send_headers(self):
+        # Returns the body to send, or None if there is none (404 / 304)
+        path = self.path.split("?", 1)[0]
+        entry = STORE.get(path)
+        if entry is None:
+            self.send_error(404)
+            return None
+
+        etag, body = entry
+        if self._not_modified(etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return None
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        return body
+
+    def _not_modified(self, etag):
+        # Weak comparison (RFC 9110 13.1.2): W/"x" matches "x"
+        inm = self.headers.get("If-None-Match", "").strip()
+        if inm == "*": return True
+        tags = [t.strip() for t in inm.split(",")]
+        return etag in [t[2:] if t.startswith("W/") else t for t in tags]
+
+    def log_message(self, format, *args):
+        pass # scraper output is noisy enough
+
+
+def load_published(name):
+    # Serve the last published snapshot until the first live run finishes
+    path = f"public/{name}.json"
+    if not os.path.exists(path): return
+    try:
+        with open(path, encoding='utf-8') as f:
+            STORE.update(name, json.load(f))
+    except Exception as e:
+        print(f"[daemon] Could not load {path}: {e}", flush=True)
+
+
+def run_provider(name, module, interval, kwargs):
+    time.sleep(random.uniform(0, START_SPREAD))
+    while True:
+        started = time.time()
+        try:
+            products = module.scrape_all(**kwargs)
+            STORE.update(name, products)
+            print(f"[daemon] {name}: {len(products)} products in {time.time() - started:.0f}s", flush=True)
+        except Exception as e:
+            print(f"[daemon] {name} failed: {e}", flush=True)
+        else:
+            try:
+                summary.write_summary(STORE.snapshot())
+            except Exception as e:
+                print(f"[daemon] Could not write {summary.SUMMARY_PATH}: {e}", flush=True)
+        time.sleep(interval * random.uniform(1 - JITTER, 1 + JITTER))
+
+
+def parse_providers(value):
+    names = [n.strip() for n in value.split(",") if n.strip()]
+    unknown = [n for n in names if n not in PROVIDERS]
+    if unknown or not names:
+        raise argparse.ArgumentTypeError(f"unknown provider(s) {', '.join(unknown) or value!r}; choose from: " + ", ".join(PROVIDERS))
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run all scrapers continuously and serve results over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--providers", type=parse_providers, default=list(PROVIDERS), help="comma-separated subset of: " + ", ".join(PROVIDERS))
+    args = parser.parse_args()
+
+    # Provider threads run concurrently: publish summary.json once per update
+    # from the in-memory results instead of from every scrape_all()
+    summary.AUTO_WRITE = False
+
+    for name in args.providers:
+        module, interval, kwargs = PROVIDERS[name]
+        load_published(name)
+        threading.Thread(target=run_provider, args=(name, module, interval, kwargs), name=name, daemon=True).start()
+
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    print(f"[daemon] Serving on http://{args.host}:{args.port}/ (/all.json, /summary.json, /<provider>.json)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
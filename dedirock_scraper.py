@@ -1,11 +1,14 @@
-import requests
 from bs4 import BeautifulSoup
-import json
-import os
 import concurrent.futures
 import re
+import argparse
+
+from common import new_session
+import shards
 
 BASE_URL = "https://billing.dedirock.com/cart.php?a=add&pid={}"
+MAX_PID = 1000
+POOL_SIZE = 50 # matches the worker count
 PRODUCTS = []
 
 def parse_specs(text, title):
@@ -78,11 +81,11 @@ def check_pid(pid):
         url = BASE_URL.format(pid)
         
         # Use Session for cookies
-        with requests.Session() as s:
-            s.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            })
-            res = s.get(url, timeout=12)
+        s = new_session(POOL_SIZE)
+        s.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+        })
+        res = s.get(url, timeout=12)
         
         # Check success
         if res.status_code != 200: return None
@@ -211,20 +214,23 @@ def check_pid(pid):
         # pass
     return None
 
-def scrape_all():
-    print("Starting concurrent scan of PIDs 0-1000...")
+def product_key(p):
+    return p['id']
+
+def scrape_all(shard=None):
+    pids = shards.shard_pids(range(MAX_PID), shard)
+    print(f"Starting concurrent scan of {len(pids)} PIDs in 0-{MAX_PID}...")
     with concurrent.futures.ThreadPoolExecutor(max_workers=50) as executor:
-        results = list(executor.map(check_pid, range(1000))) 
+        results = list(executor.map(check_pid, pids))
     
     clean_results = [r for r in results if r]
     print(f"Total found: {len(clean_results)}")
     
-    # Sort by value score descending
-    os.makedirs("public", exist_ok=True)
-    clean_results.sort(key=lambda x: x['value_score'], reverse=True)
-    
-    with open("public/dedirock.json", "w", encoding='utf-8') as f:
-        json.dump(clean_results, f, indent=2, ensure_ascii=False)
+    # Sorted by value score descending (sharded runs write a partial instead)
+    return shards.publish("dedirock", clean_results, product_key, shard)
 
 if __name__ == "__main__":
-    scrape_all()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shard", type=shards.parse_shard, help="only scan PIDs of shard i/N, write a partial result")
+    args = parser.parse_args()
+    scrape_all(args.shard)
@@ -1,15 +1,19 @@
 import requests
 from bs4 import BeautifulSoup
 import re
-import json
-import os
 import concurrent.futures
 import threading
 from urllib.parse import urlparse, parse_qs
+import argparse
+
+import checkpoint
+from common import new_session
+import shards
 
 # CONFIG
 BASE_URL = "https://my.racknerd.com"
 MAX_PID = 2000 # Standard Range
+POOL_SIZE = 20 # matches the worker count
 
 seen_urls = set()
 # ... (omitted)
@@ -36,6 +40,7 @@ def check_pid(pid):
 
 url_lock = threading.Lock() 
 all_products = {}
+pid_urls = {} # pid -> URL it claimed in seen_urls (for consistent checkpoints)
 
 def parse_specs(text, title):
     specs = {
@@ -229,7 +234,7 @@ def crawl_categories():
     print("Crawling Store Categories...")
     url = f"{BASE_URL}/index.php?rp=/store"
     try:
-        res = requests.get(url, timeout=15, headers={'User-Agent': 'Mozilla/5.0...'})
+        res = new_session(POOL_SIZE).get(url, timeout=15, headers={'User-Agent': 'Mozilla/5.0...'})
         if res.status_code == 200:
             soup = BeautifulSoup(res.text, 'html.parser')
             # Sidebar categories or Main list
@@ -252,14 +257,14 @@ def crawl_categories():
                     # Scrape this category
                     try:
                         print(f"Scraping Category: {full_url}")
-                        cat_res = requests.get(full_url, timeout=15, headers={'User-Agent': 'Mozilla/5.0...'})
+                        cat_res = new_session(POOL_SIZE).get(full_url, timeout=15, headers={'User-Agent': 'Mozilla/5.0...'})
                         cat_soup = BeautifulSoup(cat_res.text, 'html.parser')
                         items = scrape_page(full_url, cat_soup)
                         if items:
                             print(f"Category found {len(items)} items.", flush=True)
-                            for p in items:
-                                key = f"{p['title']}_{p['raw_price']}"
-                                all_products[key] = p
+                            with url_lock:
+                                for p in items:
+                                    shards.add_product(all_products, product_key, p)
                     except Exception as e:
                         print(f"Cat Error {full_url}: {e}")
                         
@@ -272,55 +277,145 @@ def check_pid(pid):
     
     try:
         # print(f"Checking PID {pid}...", flush=True)
-        with requests.Session() as s:
-            s.headers.update(headers)
-            res = s.get(url, allow_redirects=True, timeout=10)
-            
-            # FIX: Do not strip query params! RackNerd uses index.php?rp=...
-            final_url = res.url 
-            
-            # FILTER: skip shared/reseller redirects
-            f_lower = final_url.lower()
-            if "shared" in f_lower or "reseller" in f_lower or "web-hosting" in f_lower: return []
-            
-            with url_lock:
-                if final_url in seen_urls:
-                    return []
-                seen_urls.add(final_url)
-            
-            if res.status_code == 200:
-                soup = BeautifulSoup(res.text, 'html.parser')
-                if "Shopping Cart" in soup.title.string or "RackNerd" in soup.title.string:
-                     items = scrape_page(res.url, soup)
-                     if items:
-                         print(f"PID {pid} found {len(items)} products on {final_url}", flush=True)
-                         return items
-                         
+        s = new_session(POOL_SIZE)
+        s.headers.update(headers)
+        res = s.get(url, allow_redirects=True, timeout=10)
+
+        # Rate limits / server errors are transient: report a failure (None)
+        # so the PID stays pending in the checkpoint instead of counting as done
+        if res.status_code == 429 or res.status_code >= 500:
+            print(f"Error {pid}: HTTP {res.status_code}", flush=True)
+            return None
+
+        # FIX: Do not strip query params! RackNerd uses index.php?rp=...
+        final_url = res.url 
+
+        # FILTER: skip shared/reseller redirects
+        f_lower = final_url.lower()
+        if "shared" in f_lower or "reseller" in f_lower or "web-hosting" in f_lower: return []
+
+        with url_lock:
+            if final_url in seen_urls:
+                return []
+            seen_urls.add(final_url)
+            pid_urls[pid] = final_url
+
+        if res.status_code == 200:
+            soup = BeautifulSoup(res.text, 'html.parser')
+            if "Shopping Cart" in soup.title.string or "RackNerd" in soup.title.string:
+                 items = scrape_page(res.url, soup)
+                 if items:
+                     print(f"PID {pid} found {len(items)} products on {final_url}", flush=True)
+                     return items
+
+    except (requests.Timeout, requests.ConnectionError) as e:
+        # Timeouts, dropped connections, DNS failures: retry on --resume.
+        # Other errors (redirect loops, bad URLs...) won't fix themselves.
+        print(f"Error {pid}: {e}", flush=True)
+        return None
     except Exception as e:
         print(f"Error {pid}: {e}", flush=True)
     return []
 
-def scrape_all():
-    crawl_categories() # Step 1: Discover known categories
+def product_key(p):
+    return f"{p['title']}_{p['raw_price']}"
+
+def save_checkpoint(path, done_pids, categories_done, attempts):
+    with url_lock:
+        # URLs claimed by PIDs still in flight are left out, so on resume
+        # those PIDs are re-checked instead of being skipped as "seen"
+        in_flight = {u for pid, u in pid_urls.items() if pid not in done_pids}
+        state = {
+            "categories_done": categories_done,
+            "done_pids": checkpoint.encode_pids(done_pids),
+            "attempts": {str(pid): n for pid, n in attempts.items()},
+            "seen_urls": sorted(seen_urls - in_flight),
+            "products": list(all_products.values()),
+        }
+    checkpoint.save(path, state)
+
+def scrape_all(shard=None, resume=False):
+    # Reset shared state so repeated runs (daemon mode) start from scratch
+    with url_lock:
+        seen_urls.clear()
+        all_products.clear()
+        pid_urls.clear()
+
+    state_path = checkpoint.state_path("rn", shard)
+    done_pids = set()
+    attempts = {} # pid -> failed attempts so far, across resumed runs
+    # Step 1: Discover known categories (once per sweep, not once per shard)
+    categories_done = shard is not None and shard[0] != 0
+
+    state = checkpoint.load(state_path) if resume else None
+    if state:
+        done_pids = checkpoint.decode_pids(state['done_pids'])
+        categories_done = state['categories_done']
+        attempts = {int(pid): n for pid, n in state.get('attempts', {}).items()}
+        seen_urls.update(state['seen_urls'])
+        for p in state['products']:
+            shards.add_product(all_products, product_key, p)
+        print(f"Resuming from {state_path}: {len(done_pids)} PIDs done, {len(all_products)} products so far")
+
+    if not categories_done:
+        crawl_categories()
+        categories_done = True
+        save_checkpoint(state_path, done_pids, categories_done, attempts)
     
-    print(f"Starting Hybrid PID Scan 0-{MAX_PID}...")
+    pids = [pid for pid in shards.shard_pids(range(MAX_PID), shard) if pid not in done_pids]
+    print(f"Starting Hybrid PID Scan of {len(pids)} PIDs in 0-{MAX_PID}...")
     
-    with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-        results = list(executor.map(check_pid, range(MAX_PID)))
-        
-    for r in results:
-        for p in r:
-            key = f"{p['title']}_{p['raw_price']}"
-            all_products[key] = p
+    failed = set()
+    gave_up = set()
+    ticker = checkpoint.Checkpointer()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=20)
+    try:
+        futures = {executor.submit(check_pid, pid): pid for pid in pids}
+        for fut in concurrent.futures.as_completed(futures):
+            pid = futures[fut]
+            items = fut.result()
+            if items is None:
+                attempts[pid] = attempts.get(pid, 0) + 1
+                if attempts[pid] < checkpoint.MAX_ATTEMPTS:
+                    failed.add(pid)
+                    continue
+                # Out of retries: treat as done so one bad PID can't block publishing
+                gave_up.add(pid)
+                items = []
+            with url_lock:
+                for p in items:
+                    shards.add_product(all_products, product_key, p)
+                done_pids.add(pid)
+            if ticker.tick():
+                save_checkpoint(state_path, done_pids, categories_done, attempts)
+    except BaseException:
+        # Ctrl-C etc.: keep what we have and don't wait for the queued PIDs
+        save_checkpoint(state_path, done_pids, categories_done, attempts)
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+
+    if failed:
+        # Don't publish a sweep with holes; --resume retries just these PIDs
+        save_checkpoint(state_path, done_pids, categories_done, attempts)
+        raise RuntimeError(f"{len(failed)} PIDs failed, progress kept in {state_path}; rerun with --resume")
+    if gave_up:
+        print(f"WARNING: publishing without {len(gave_up)} PIDs that failed {checkpoint.MAX_ATTEMPTS} times: {sorted(gave_up)}", flush=True)
             
     final_list = list(all_products.values())
     print(f"Total Unique Products: {len(final_list)}")
     
-    os.makedirs("public", exist_ok=True)
-    final_list.sort(key=lambda x: x['value_score'], reverse=True)
-    
-    with open("public/rn.json", "w", encoding='utf-8') as f:
-        json.dump(final_list, f, indent=2, ensure_ascii=False)
+    # Sorted by value score descending (sharded runs write a partial instead)
+    final_list = shards.publish("rn", final_list, product_key, shard)
+    checkpoint.clear(state_path)
+    return final_list
 
 if __name__ == "__main__":
-    scrape_all()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shard", type=shards.parse_shard, help="only scan PIDs of shard i/N, write a partial result")
+    parser.add_argument("--resume", action="store_true", help=f"skip work recorded in {checkpoint.STATE_DIR}/ by an interrupted run")
+    args = parser.parse_args()
+    try:
+        scrape_all(args.shard, args.resume)
+    except RuntimeError as e:
+        raise SystemExit(str(e))
@@ -0,0 +1,99 @@
+import argparse
+import glob
+import importlib
+import json
+import os
+
+from common import write_json
+import summary
+
+# Splitting PID sweeps across processes / CI matrix jobs.
+# Each shard writes shards/<name>.<i>of<N>.json; merge them with:
+#   python shards.py rn
+
+SHARD_DIR = "shards"
+
+# name -> scraper module (must define product_key)
+PROVIDERS = {
+    "dedirock": "dedirock_scraper",
+    "rn": "rn_scraper",
+}
+
+def parse_shard(value):
+    # "i/N" -> (i, N), for argparse
+    try:
+        i, n = (int(x) for x in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N, got {value!r}")
+    if n < 1 or not 0 <= i < n:
+        raise argparse.ArgumentTypeError(f"shard index must be in 0..N-1, got {value!r}")
+    return i, n
+
+def shard_pids(pids, shard):
+    # Interleave so every shard gets a similar mix of low (dense) and high (sparse) PIDs
+    if shard is None: return list(pids)
+    i, n = shard
+    return [p for p in pids if p % n == i]
+
+def _canonical(p):
+    return json.dumps(p, sort_keys=True, ensure_ascii=False)
+
+def add_product(products, key, p):
+    # Insert into a key -> product dict. On collisions keep the canonically
+    # smallest record, so the winner doesn't depend on arrival order.
+    k = key(p)
+    cur = products.get(k)
+    if cur is None or _canonical(p) < _canonical(cur):
+        products[k] = p
+
+def finalize(products, key):
+    unique = {}
+    for p in products:
+        add_product(unique, key, p)
+    final_list = list(unique.values())
+    # Sort by value score descending, product key breaks ties
+    final_list.sort(key=lambda x: (-x['value_score'], str(key(x))))
+    return final_list
+
+def partial_path(name, shard):
+    i, n = shard
+    return f"{SHARD_DIR}/{name}.{i}of{n}.json"
+
+def publish(name, products, key, shard=None):
+    # Unsharded runs go straight to public/; shards write a partial for merge()
+    if shard is not None:
+        write_json(partial_path(name, shard), products)
+        return products
+    final_list = finalize(products, key)
+    write_json(f"public/{name}.json", final_list)
+    summary.publish_summary()
+    return final_list
+
+def merge(name, key, shard_dir=SHARD_DIR):
+    paths = sorted(glob.glob(os.path.join(shard_dir, f"{name}.*of*.json")))
+    if not paths:
+        raise SystemExit(f"No partial results for {name} in {shard_dir}/")
+
+    # Refuse to publish a partial sweep: every shard of a single N must be present
+    found = {tuple(int(x) for x in os.path.basename(p).split(".")[1].split("of")) for p in paths}
+    counts = {n for _, n in found}
+    if len(counts) != 1 or len(found) != next(iter(counts)):
+        raise SystemExit(f"Incomplete shard set for {name}: {sorted(found)}")
+
+    products = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            products.extend(json.load(f))
+
+    final_list = publish(name, products, key)
+    print(f"Merged {len(paths)} shards of {name}: {len(final_list)} unique products")
+    return final_list
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge sharded partial results into public/<name>.json.")
+    parser.add_argument("name", choices=sorted(PROVIDERS))
+    parser.add_argument("--dir", default=SHARD_DIR, help="directory holding the partial results")
+    args = parser.parse_args()
+
+    module = importlib.import_module(PROVIDERS[args.name])
+    merge(args.name, module.product_key, args.dir)
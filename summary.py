@@ -0,0 +1,141 @@
+import glob
+import json
+import os
+import re
+import statistics
+import threading
+
+from common import write_json
+
+# Group-by summaries over every provider's products, published as
+# public/summary.json so the frontend doesn't have to crunch the full lists.
+
+SUMMARY_PATH = "public/summary.json"
+AUTO_WRITE = True # daemon mode turns this off and writes from its in-memory results
+_write_lock = threading.Lock()
+
+# Billing period in the price text -> months; anything else is taken as monthly
+BILLING_MONTHS = [
+    (r'semi-?annual', 6),
+    (r'bienn', 24),
+    (r'trienn', 36),
+    (r'quarter', 3),
+    (r'annual|year|\byr\b', 12),
+]
+
+# (label, upper bound in MB, exclusive)
+RAM_TIERS = [
+    ("<1GB", 1024),
+    ("1-2GB", 2 * 1024),
+    ("2-4GB", 4 * 1024),
+    ("4-8GB", 8 * 1024),
+    ("8-16GB", 16 * 1024),
+    ("16-32GB", 32 * 1024),
+    ("32-64GB", 64 * 1024),
+    ("64GB+", float("inf")),
+]
+
+def ram_tier(ram_mb):
+    if not ram_mb: return "unknown"
+    for label, limit in RAM_TIERS:
+        if ram_mb < limit: return label
+
+def monthly_price(p):
+    # Providers mix billing periods ("$10.18 USD Annually", "$22 / Year"),
+    # so compare prices per month
+    for pattern, months in BILLING_MONTHS:
+        if re.search(pattern, p['price'], re.IGNORECASE):
+            return p['raw_price'] / months
+    return p['raw_price']
+
+def disk_type(disk):
+    # "2x 2TB SSD" -> "SSD", "N/A" -> None
+    if not disk or disk == "N/A": return None
+    return disk.split()[-1].upper()
+
+def _pick(provider, p, *fields):
+    out = {"provider": provider, "id": p['id'], "title": p['title']}
+    for f in fields:
+        out[f] = p[f]
+    out["purchase_url"] = p['purchase_url']
+    return out
+
+def summarize(products_by_provider):
+    providers = {}
+    ram_tiers = {}
+    cheapest = {}  # location -> (sort key, entry)
+    best_disk = {} # disk type -> (sort key, entry)
+
+    for provider in sorted(products_by_provider):
+        per_gb = []
+        tiers = {}
+        for p in products_by_provider[provider]:
+            specs = p['specs']
+            price = monthly_price(p)
+
+            tier = ram_tier(specs['ram'])
+            tiers[tier] = tiers.get(tier, 0) + 1
+            ram_tiers[tier] = ram_tiers.get(tier, 0) + 1
+
+            if price > 0 and specs['ram']:
+                per_gb.append(price / (specs['ram'] / 1024))
+
+            if price > 0:
+                k = (price, provider, str(p['id']))
+                loc = specs['location']
+                if loc not in cheapest or k < cheapest[loc][0]:
+                    entry = _pick(provider, p, 'price')
+                    entry["monthly_price"] = round(price, 2)
+                    cheapest[loc] = (k, entry)
+
+            dtype = disk_type(specs['disk'])
+            if dtype:
+                k = (-p['value_score'], provider, str(p['id']))
+                if dtype not in best_disk or k < best_disk[dtype][0]:
+                    entry = _pick(provider, p, 'value_score', 'price')
+                    entry["monthly_price"] = round(price, 2)
+                    best_disk[dtype] = (k, entry)
+
+        providers[provider] = {
+            "count": len(products_by_provider[provider]),
+            "median_monthly_price_per_gb_ram": round(statistics.median(per_gb), 4) if per_gb else None,
+            "ram_tiers": _by_tier(tiers),
+        }
+
+    return {
+        "providers": providers,
+        "ram_tiers": _by_tier(ram_tiers),
+        "cheapest_monthly_by_location": {loc: cheapest[loc][1] for loc in sorted(cheapest)},
+        "best_value_by_disk_type": {d: best_disk[d][1] for d in sorted(best_disk)},
+    }
+
+def _by_tier(counts):
+    order = [label for label, _ in RAM_TIERS] + ["unknown"]
+    return {t: counts[t] for t in order if t in counts}
+
+def load_published(public_dir="public"):
+    products_by_provider = {}
+    for path in sorted(glob.glob(os.path.join(public_dir, "*.json"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        if name == "summary": continue
+        with open(path, encoding='utf-8') as f:
+            products_by_provider[name] = json.load(f)
+    return products_by_provider
+
+def publish_summary():
+    # Hook run after each scrape_all() publishes public/<name>.json
+    if AUTO_WRITE:
+        write_summary()
+
+def write_summary(products_by_provider=None):
+    # Providers passed in (e.g. the daemon's in-memory results) take precedence
+    # over their published files; the others are read from public/
+    with _write_lock:
+        data = load_published()
+        data.update(products_by_provider or {})
+        data = summarize(data)
+        write_json(SUMMARY_PATH, data)
+    return data
+
+if __name__ == "__main__":
+    write_summary()